@@ -21,14 +21,61 @@ import pandas as pd
 from datetime import datetime
 from pathlib import Path
 import io
+import csv
+import hashlib
+import importlib.util
+import os
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_script_directory():
     """Get the directory where this script is located."""
     return Path(__file__).resolve().parent
 
 
 SCRIPT_DIR = get_script_directory()
+DEFAULT_CODING_PATH = SCRIPT_DIR / 'validation_samples' / 'production' / 'coding_phillips.csv'
+
+# Classification options shown to coders
+CATEGORIES = ['steep', 'flat', 'moderate', 'none']
+CATEGORY_LABELS = {
+    'steep': 'STEEP - Labor markets SIGNIFICANTLY affect inflation',
+    'flat': 'FLAT - Labor markets have LITTLE/NO effect on inflation',
+    'moderate': 'MODERATE - Qualified/partial relationship',
+    'none': 'NONE - No Phillips curve belief expressed'
+}
+
+CLASSIFICATION_GUIDE_MD = """
+**STEEP**: The speaker indicates labor market conditions
+SIGNIFICANTLY affect inflation.
+- Causal language: "drives", "causes", "leads to"
+- Concern: "will feed into", "translate to"
+- Example: "Tight labor markets are driving wage pressures
+  that will feed into core inflation"
+
+**FLAT**: The speaker indicates labor markets have
+LITTLE or NO effect on inflation.
+- Disconnection: "despite", "hasn't translated"
+- Skepticism: "broken", "dead", "no longer valid"
+- Example: "Despite unemployment below 4%, we've seen
+  no acceleration in inflation"
+
+**MODERATE**: The speaker indicates a QUALIFIED or
+PARTIAL relationship.
+- Hedging: "some", "modest", "limited"
+- Example: "Tight labor may generate some inflation
+  pressure, but effects are modest"
+
+**NONE** (default): No Phillips curve belief expressed.
+- Mentions labor OR inflation, but not both
+- Mentions both but no causal connection
+- Pure description without interpreting relationship
+"""
+
+# st.fragment (Streamlit >= 1.37) reruns only the decorated block on widget changes;
+# older releases fall back to running it as part of the full script.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
 
 # Page configuration
 st.set_page_config(
@@ -38,38 +85,172 @@ st.set_page_config(
 )
 
 
-@st.cache_data
-def load_coding_data_from_file(file_content):
-    """Load the coding sample data from uploaded file."""
-    return pd.read_csv(io.StringIO(file_content.decode('utf-8')))
+TEXT_COLUMNS = ('quotation', 'description', 'explanation', 'variable')
+RESULT_FIELDS = ['coding_id', 'coder_name', 'classification', 'notes', 'coded_at']
+
+# Parquet export needs a pandas Parquet engine, which is optional
+PARQUET_AVAILABLE = any(importlib.util.find_spec(m) is not None for m in ('pyarrow', 'fastparquet'))
+
+
+def read_csv_fast(source):
+    """Read a CSV with the multithreaded pyarrow parser, falling back to the C engine."""
+    try:
+        return pd.read_csv(source, engine='pyarrow')
+    except ImportError:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_csv(source, low_memory=False, cache_dates=True)
+
+
+def normalize_coding_df(df):
+    """Coerce text columns to stripped strings ('' for missing) once at load time."""
+    for col in TEXT_COLUMNS:
+        if col in df:
+            df[col] = df[col].fillna('').astype(str).str.strip()
+        else:
+            df[col] = ''
+    return df
+
+
+@st.cache_data(max_entries=8)
+def load_coding_data_from_file(content_digest, _file_content):
+    """
+    Load the coding sample data from uploaded file.
+
+    The cache is keyed on a precomputed content digest; the leading underscore
+    tells Streamlit not to hash the raw bytes itself.
+    """
+    return normalize_coding_df(read_csv_fast(io.BytesIO(_file_content)))
+
+
+def upload_digest(uploaded_file):
+    """
+    Return the content digest of an uploaded coding file.
+
+    The bytes are hashed once per upload (file_id) and the digest is kept in
+    session state, so reruns don't re-hash the whole file.
+    """
+    cached = st.session_state.get('upload_digest')
+    if cached is None or cached[0] != uploaded_file.file_id:
+        digest = hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest()
+        cached = st.session_state.upload_digest = (uploaded_file.file_id, digest)
+    return cached[1]
 
 
 @st.cache_data
 def load_default_coding_data():
     """Load the default coding data from the repo."""
-    coding_file = SCRIPT_DIR / 'validation_samples' / 'production' / 'coding_phillips.csv'
-    if coding_file.exists():
-        return pd.read_csv(coding_file)
+    if DEFAULT_CODING_PATH.exists():
+        return normalize_coding_df(read_csv_fast(DEFAULT_CODING_PATH))
     return None
 
 
-def get_results_csv(results):
+@st.cache_data(max_entries=2048)
+def build_row_html(data_key, coding_id, _quotation, _description, _explanation):
+    """
+    Build the quotation/description/explanation HTML blocks for one argument.
+
+    Cached on (data_key, coding_id) only; the underscored text arguments are
+    not hashed, since rows never change once a data source is loaded.
+
+    Returns:
+        tuple: (quotation_html, description_html or None, explanation_html or None)
+    """
+    quotation_html = f"""<div style="background-color: #f0f2f6; padding: 20px;
+                border-radius: 10px; font-size: 16px; line-height: 1.6;">
+                {_quotation}
+                </div>"""
+
+    description_html = None
+    if _description:
+        description_html = f"""<div style="background-color: #e8f4f8; padding: 15px;
+                    border-radius: 8px; font-size: 14px; margin-top: 10px;">
+                    {_description}
+                    </div>"""
+
+    explanation_html = None
+    if _explanation:
+        explanation_html = f"""<div style="background-color: #fff4e6; padding: 15px;
+                    border-radius: 8px; font-size: 14px; margin-top: 10px;">
+                    {_explanation}
+                    </div>"""
+
+    return quotation_html, description_html, explanation_html
+
+
+def get_results_csv(results_by_id):
     """Convert results to CSV for download."""
-    df = pd.DataFrame(results)
-    return df.to_csv(index=False).encode('utf-8')
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=RESULT_FIELDS, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(results_by_id.values())
+    return buf.getvalue().encode('utf-8')
+
+
+def get_results_parquet(results_by_id):
+    """Convert results to Parquet for download."""
+    # Build columns directly rather than having pandas infer them from a list of dicts
+    results = results_by_id.values()
+    columns = {field: [r[field] for r in results] for field in RESULT_FIELDS}
+    buf = io.BytesIO()
+    pd.DataFrame(columns, columns=RESULT_FIELDS).to_parquet(buf, index=False)
+    return buf.getvalue()
+
+
+RESULT_EXPORTERS = {
+    'csv': get_results_csv,
+    'parquet': get_results_parquet,
+}
+
+
+def get_cached_results_export(fmt):
+    """Return results encoded as fmt ('csv' or 'parquet'), re-encoding only after results have changed."""
+    cache = st.session_state.results_export_cache
+    if st.session_state.results_dirty:
+        cache.clear()
+        st.session_state.results_dirty = False
+    if fmt not in cache:
+        cache[fmt] = RESULT_EXPORTERS[fmt](st.session_state.results_by_id)
+    return cache[fmt]
 
 
-def get_previous_coding(coding_id, results):
+def get_cached_results_csv():
+    """Return results CSV bytes, re-encoding only after results have changed."""
+    return get_cached_results_export('csv')
+
+
+def read_results_file(uploaded_file):
+    """Read a previously downloaded results file (CSV or Parquet)."""
+    if uploaded_file.name.lower().endswith('.parquet'):
+        return pd.read_parquet(uploaded_file)
+    # C engine with coded_at as str: the pyarrow engine parses the ISO timestamps into datetimes
+    # (even with dtype=str), which then mix with the isoformat() strings of new saves. Other
+    # columns keep inferred dtypes so numeric coding_ids match those of read_csv_fast.
+    return pd.read_csv(uploaded_file, dtype={'coded_at': str})
+
+
+# Whitespace and path separators are replaced so coder names are filename-safe
+_SAFE_NAME_TABLE = str.maketrans({c: '_' for c in ' \t\n\r/\\'})
+
+
+def make_download_filename(coder_name, timestamp=None):
+    """Build a timestamped results filename for the given coder (defaults to now)."""
+    safe_name = coder_name.translate(_SAFE_NAME_TABLE).lower()
+    return f"coded_{safe_name}_phillips_{timestamp or datetime.now():%Y%m%d_%H%M%S}.csv"
+
+
+def get_previous_coding(coding_id, results_by_id):
     """Get previous coding values for a specific coding_id."""
-    for result in results:
-        if result.get('coding_id') == coding_id:
-            return result
-    return None
+    return results_by_id.get(coding_id)
 
 
-def validate_resume_csv(resume_df, coding_df):
+def validate_resume_csv(resume_df, coding_ids):
     """
     Validate that a resume CSV is compatible with the current coding data.
+
+    Args:
+        resume_df (pd.DataFrame): Previously downloaded results
+        coding_ids (set): coding_ids of the current data source
     
     Returns:
         tuple: (is_valid, message, matching_ids)
@@ -79,8 +260,7 @@ def validate_resume_csv(resume_df, coding_df):
         missing = required_cols - set(resume_df.columns)
         return False, f"Missing required columns: {missing}", set()
     
-    resume_ids = set(resume_df['coding_id'].tolist())
-    coding_ids = set(coding_df['coding_id'].tolist())
+    resume_ids = set(resume_df['coding_id'])
     
     matching_ids = resume_ids.intersection(coding_ids)
     unmatched_ids = resume_ids - coding_ids
@@ -94,18 +274,213 @@ def validate_resume_csv(resume_df, coding_df):
     return True, f"Successfully validated {len(matching_ids)} coded arguments", matching_ids
 
 
+def get_coding_df(data_key, loader):
+    """
+    Return the session's coding DataFrame, calling loader only when the data source changes.
+
+    st.cache_data hands back a fresh copy on every call, so the loaded frame is
+    pinned in session state once and per-source derived state is rebuilt alongside it.
+    """
+    if st.session_state.get('data_key') != data_key:
+        coding_df = loader()
+        if coding_df is None:
+            return None
+        st.session_state.coding_df = coding_df
+        st.session_state.coding_ids_set = set(coding_df['coding_id'])
+        # Plain dicts are much cheaper to index per rerun than coding_df.iloc
+        st.session_state.records = coding_df[['coding_id', *TEXT_COLUMNS]].to_dict('records')
+        st.session_state.total_arguments = len(coding_df)
+        st.session_state.data_key = data_key
+    return st.session_state.coding_df
+
+
 def initialize_session_state():
     """Initialize all session state variables."""
     if 'current_index' not in st.session_state:
         st.session_state.current_index = 0
-    if 'results' not in st.session_state:
-        st.session_state.results = []
-    if 'coded_ids' not in st.session_state:
-        st.session_state.coded_ids = set()
+    if 'results_by_id' not in st.session_state:
+        # Keyed by coding_id for O(1) lookup/update; insertion order is kept for export
+        st.session_state.results_by_id = {}
+    if 'results_export_cache' not in st.session_state:
+        st.session_state.results_export_cache = {}
+    if 'results_dirty' not in st.session_state:
+        st.session_state.results_dirty = True
     if 'widget_version' not in st.session_state:
         st.session_state.widget_version = 0
     if 'locked_coder_name' not in st.session_state:
         st.session_state.locked_coder_name = None
+    if 'download_filename' not in st.session_state:
+        st.session_state.download_filename = None
+
+
+@fragment
+def render_current_argument(coder_name, current_index, total_arguments):
+    """
+    Render the current argument with its classification widgets and navigation.
+
+    Runs as a fragment, so interactions here rerun only this block rather than
+    the sidebar and data loading. Navigation and any Save that writes a record
+    call st.rerun(), which reruns the full app so progress stays in sync.
+    """
+    # Get current widget version for keying
+    v = st.session_state.widget_version
+
+    current_row = st.session_state.records[current_index]
+    coding_id = current_row['coding_id']
+    quotation = current_row['quotation']
+    description = current_row['description']
+    explanation = current_row['explanation']
+    variable = current_row['variable']
+
+    previous_coding = get_previous_coding(coding_id, st.session_state.results_by_id)
+    is_coded = previous_coding is not None
+
+    # Two-column layout
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        st.subheader(f"Argument {coding_id}")
+
+        if variable:
+            st.caption(f"Economic Variable: **{variable}**")
+
+        if is_coded:
+            st.success("✓ Already coded - you can update or skip")
+
+        quotation_html, description_html, explanation_html = build_row_html(
+            st.session_state.data_key, coding_id, quotation, description, explanation
+        )
+
+        # Quotation
+        st.markdown("**Quotation:**")
+        st.markdown(quotation_html, unsafe_allow_html=True)
+
+        # Description
+        if description_html:
+            st.markdown("**Description:**")
+            st.markdown(description_html, unsafe_allow_html=True)
+
+        # Explanation
+        if explanation_html:
+            st.markdown("**Explanation:**")
+            st.markdown(explanation_html, unsafe_allow_html=True)
+
+    with col2:
+        st.subheader("Classification")
+
+        st.markdown("""
+        **Does this speaker express a belief about how labor market
+        conditions affect inflation (Phillips curve)?**
+        """)
+
+        # Get default value from previous coding
+        default_idx = 3  # Default to none
+        if previous_coding:
+            prev_cat = previous_coding.get('classification', 'none')
+            if prev_cat in CATEGORIES:
+                default_idx = CATEGORIES.index(prev_cat)
+
+        # Classification, notes and Save are batched in one form so choosing a
+        # category or typing notes does not rerun the script until Save
+        with st.form("code_arg", clear_on_submit=False):
+            # IMPORTANT: Widget key includes version number
+            # This forces Streamlit to create a fresh widget after session resume,
+            # using the index/value parameters instead of cached state
+            classification = st.radio(
+                "Select classification:",
+                options=CATEGORIES,
+                format_func=lambda x: CATEGORY_LABELS[x],
+                index=default_idx,
+                key=f"classification_{current_index}_v{v}"
+            )
+
+            # Optional notes
+            st.markdown("---")
+            notes_default = previous_coding['notes'] if previous_coding else ''
+        
+            # IMPORTANT: Widget key includes version number
+            notes = st.text_area(
+                "Notes (optional):",
+                value=notes_default,
+                max_chars=500,
+                key=f"notes_{current_index}_v{v}",
+                help="Any observations or issues with this argument"
+            )
+
+            if st.form_submit_button("💾 Save & Continue", type="primary", use_container_width=True):
+                # Lock coder name on first save
+                if st.session_state.locked_coder_name is None:
+                    st.session_state.locked_coder_name = coder_name
+            
+                # Skip the write (and CSV cache bust) when nothing changed
+                prev = st.session_state.results_by_id.get(coding_id)
+                unchanged = (
+                    prev is not None
+                    and prev['classification'] == classification
+                    and prev.get('notes', '') == notes
+                )
+
+                if not unchanged:
+                    # One clock read stamps both the record and the download filename
+                    now = datetime.now()
+                    st.session_state.results_by_id[coding_id] = {
+                        'coding_id': coding_id,
+                        'coder_name': st.session_state.locked_coder_name,
+                        'classification': classification,
+                        'notes': notes or '',
+                        'coded_at': now.isoformat()
+                    }
+                    st.session_state.results_dirty = True
+                    st.session_state.download_filename = make_download_filename(
+                        st.session_state.locked_coder_name, now
+                    )
+
+                st.success(f"Saved! ({len(st.session_state.results_by_id)} total)")
+
+                # Move to next
+                advanced = current_index < total_arguments - 1
+                if advanced:
+                    st.session_state.current_index += 1
+
+                # Full-app rerun after every write, including on the last argument, so the
+                # sidebar progress and cached download pick up the new record
+                if advanced or not unchanged:
+                    st.rerun()
+
+        # Classification guide - only sent to the browser while switched on,
+        # unlike an expander whose body is re-sent on every rerun
+        if st.checkbox("📖 Show Classification Guide", key="show_guide"):
+            st.markdown(CLASSIFICATION_GUIDE_MD)
+
+    # Navigation
+    st.markdown("---")
+    # Batched in a form so editing "Jump to" does not trigger its own rerun
+    with st.form("nav", clear_on_submit=False):
+        col_prev, col_next, col_jump = st.columns([1, 1, 2])
+
+        with col_prev:
+            if st.form_submit_button("◀ Previous", disabled=(current_index == 0), use_container_width=True):
+                st.session_state.current_index -= 1
+                st.rerun()
+
+        with col_next:
+            if st.form_submit_button("Skip ▶", disabled=(current_index == total_arguments - 1), use_container_width=True):
+                st.session_state.current_index += 1
+                st.rerun()
+
+        with col_jump:
+            # IMPORTANT: Widget key includes version number
+            jump_to = st.number_input(
+                "Jump to:",
+                min_value=1,
+                max_value=total_arguments,
+                value=current_index + 1,
+                step=1,
+                key=f"jump_{current_index}_v{v}"
+            )
+            if st.form_submit_button("Go", use_container_width=True):
+                st.session_state.current_index = jump_to - 1
+                st.rerun()
 
 
 def main():
@@ -154,7 +529,7 @@ def main():
         coding_df = None
 
         if data_source == "Use default sample":
-            coding_df = load_default_coding_data()
+            coding_df = get_coding_df('default', load_default_coding_data)
             if coding_df is None:
                 st.error("Default coding file not found. Please upload a file.")
                 st.stop()
@@ -167,24 +542,27 @@ def main():
                 help="Upload a coding CSV file"
             )
             if uploaded_file:
-                coding_df = load_coding_data_from_file(uploaded_file.getvalue())
+                # Keyed on content, not name/size: a corrected re-upload is reloaded, and the
+                # row HTML cache (shared by all sessions) never serves another file's text
+                digest = upload_digest(uploaded_file)
+                coding_df = get_coding_df(
+                    ('upload', digest),
+                    lambda: load_coding_data_from_file(digest, uploaded_file.getvalue())
+                )
                 st.success(f"Loaded {len(coding_df)} arguments")
             else:
                 st.info("Please upload a coding file")
                 st.stop()
 
-    total_arguments = len(coding_df)
+    total_arguments = st.session_state.total_arguments
     current_index = st.session_state.current_index
     
-    # Get current widget version for keying
-    v = st.session_state.widget_version
-
     # Progress tracking in sidebar
     with st.sidebar:
         st.markdown("---")
         st.header("Progress")
 
-        n_coded = len(st.session_state.coded_ids)
+        n_coded = len(st.session_state.results_by_id)
         progress_pct = n_coded / total_arguments if total_arguments > 0 else 0
         st.progress(progress_pct)
         st.write(f"Coded: {n_coded} / {total_arguments}")
@@ -194,19 +572,23 @@ def main():
         st.markdown("---")
         st.subheader("Save Results")
 
-        if st.session_state.results:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            safe_name = coder_name.lower().replace(' ', '_')
-            filename = f"coded_{safe_name}_phillips_{timestamp}.csv"
-
+        if st.session_state.results_by_id:
             st.download_button(
                 label="📥 Download Results CSV",
-                data=get_results_csv(st.session_state.results),
-                file_name=filename,
+                data=get_cached_results_csv(),
+                file_name=st.session_state.download_filename,
                 mime="text/csv",
                 help="Download your coding results"
             )
-            st.caption(f"{len(st.session_state.results)} arguments coded")
+            if PARQUET_AVAILABLE:
+                st.download_button(
+                    label="📥 Download Results Parquet",
+                    data=get_cached_results_export('parquet'),
+                    file_name=os.path.splitext(st.session_state.download_filename)[0] + '.parquet',
+                    mime="application/octet-stream",
+                    help="Smaller, faster-loading copy of your results (also accepted by Resume Session)"
+                )
+            st.caption(f"{len(st.session_state.results_by_id)} arguments coded")
         else:
             st.info("Code some arguments to enable download")
 
@@ -216,7 +598,7 @@ def main():
 
         resume_file = st.file_uploader(
             "Upload previous session",
-            type=['csv'],
+            type=['csv', 'parquet'],
             key="resume_upload",
             help="Upload a previously downloaded results file to continue"
         )
@@ -224,10 +606,12 @@ def main():
         if resume_file:
             if st.button("Load Session"):
                 try:
-                    resume_df = pd.read_csv(resume_file)
+                    resume_df = read_results_file(resume_file)
                     
                     # Validate the resume CSV
-                    is_valid, message, matching_ids = validate_resume_csv(resume_df, coding_df)
+                    is_valid, message, matching_ids = validate_resume_csv(
+                        resume_df, st.session_state.coding_ids_set
+                    )
                     
                     if not is_valid:
                         st.error(f"Cannot load session: {message}")
@@ -235,34 +619,34 @@ def main():
                         if "Warning" in message:
                             st.warning(message)
                         
-                        # Filter to only matching IDs
-                        valid_results = resume_df[resume_df['coding_id'].isin(matching_ids)].to_dict('records')
+                        # Build the index directly from matching rows in a single pass;
+                        # missing values are blanked and notes are always str
+                        results_by_id = {}
+                        for row in resume_df.reindex(columns=RESULT_FIELDS).fillna('').astype({'notes': str}).itertuples(index=False, name=None):
+                            if row[0] in matching_ids:
+                                results_by_id[row[0]] = dict(zip(RESULT_FIELDS, row))
                         
-                        st.session_state.results = valid_results
-                        st.session_state.coded_ids = set(r['coding_id'] for r in valid_results)
+                        st.session_state.results_by_id = results_by_id
+                        st.session_state.results_dirty = True
                         
                         # Lock the coder name from the resume file
-                        if len(valid_results) > 0:
-                            st.session_state.locked_coder_name = valid_results[0].get('coder_name', coder_name)
+                        if results_by_id:
+                            first = next(iter(results_by_id.values()))
+                            st.session_state.locked_coder_name = first['coder_name'] or coder_name
+                        st.session_state.download_filename = make_download_filename(
+                            st.session_state.locked_coder_name or coder_name
+                        )
                         
                         # INCREMENT WIDGET VERSION to force fresh widget state
                         # This is critical - without this, widgets show cached values
                         # instead of values from the loaded CSV
                         st.session_state.widget_version += 1
 
-                        # Jump to first uncoded argument
-                        found_uncoded = False
-                        for idx in range(len(coding_df)):
-                            if coding_df.iloc[idx]['coding_id'] not in st.session_state.coded_ids:
-                                st.session_state.current_index = idx
-                                found_uncoded = True
-                                break
-                        
-                        if not found_uncoded:
-                            # All are coded, go to last one
-                            st.session_state.current_index = len(coding_df) - 1
+                        # Jump to first uncoded argument (all coded -> last one)
+                        uncoded = (~coding_df['coding_id'].isin(list(results_by_id))).to_numpy()
+                        st.session_state.current_index = int(uncoded.argmax()) if uncoded.any() else len(coding_df) - 1
 
-                        st.success(f"Loaded {len(valid_results)} coded arguments")
+                        st.success(f"Loaded {len(results_by_id)} coded arguments")
                         st.rerun()
                         
                 except Exception as e:
@@ -270,215 +654,17 @@ def main():
 
     # Main coding area
     if current_index < total_arguments:
-        current_row = coding_df.iloc[current_index]
-        coding_id = current_row['coding_id']
-        quotation = current_row['quotation']
-        description = current_row.get('description', '')
-        explanation = current_row.get('explanation', '')
-        variable = current_row.get('variable', '')
-
-        is_coded = coding_id in st.session_state.coded_ids
-        previous_coding = get_previous_coding(coding_id, st.session_state.results) if is_coded else None
-
-        # Two-column layout
-        col1, col2 = st.columns([3, 2])
-
-        with col1:
-            st.subheader(f"Argument {coding_id}")
-
-            if variable:
-                st.caption(f"Economic Variable: **{variable}**")
-
-            if is_coded:
-                st.success("✓ Already coded - you can update or skip")
-
-            # Quotation
-            st.markdown("**Quotation:**")
-            st.markdown(
-                f"""<div style="background-color: #f0f2f6; padding: 20px;
-                border-radius: 10px; font-size: 16px; line-height: 1.6;">
-                {quotation}
-                </div>""",
-                unsafe_allow_html=True
-            )
-
-            # Description
-            if pd.notna(description) and str(description).strip():
-                st.markdown("**Description:**")
-                st.markdown(
-                    f"""<div style="background-color: #e8f4f8; padding: 15px;
-                    border-radius: 8px; font-size: 14px; margin-top: 10px;">
-                    {description}
-                    </div>""",
-                    unsafe_allow_html=True
-                )
-
-            # Explanation
-            if pd.notna(explanation) and str(explanation).strip():
-                st.markdown("**Explanation:**")
-                st.markdown(
-                    f"""<div style="background-color: #fff4e6; padding: 15px;
-                    border-radius: 8px; font-size: 14px; margin-top: 10px;">
-                    {explanation}
-                    </div>""",
-                    unsafe_allow_html=True
-                )
-
-        with col2:
-            st.subheader("Classification")
-
-            st.markdown("""
-            **Does this speaker express a belief about how labor market
-            conditions affect inflation (Phillips curve)?**
-            """)
-
-            # Get default value from previous coding
-            categories = ['steep', 'flat', 'moderate', 'none']
-            category_labels = {
-                'steep': 'STEEP - Labor markets SIGNIFICANTLY affect inflation',
-                'flat': 'FLAT - Labor markets have LITTLE/NO effect on inflation',
-                'moderate': 'MODERATE - Qualified/partial relationship',
-                'none': 'NONE - No Phillips curve belief expressed'
-            }
-
-            default_idx = 3  # Default to none
-            if previous_coding:
-                prev_cat = previous_coding.get('classification', 'none')
-                if prev_cat in categories:
-                    default_idx = categories.index(prev_cat)
-
-            # IMPORTANT: Widget key includes version number
-            # This forces Streamlit to create a fresh widget after session resume,
-            # using the index/value parameters instead of cached state
-            classification = st.radio(
-                "Select classification:",
-                options=categories,
-                format_func=lambda x: category_labels[x],
-                index=default_idx,
-                key=f"classification_{current_index}_v{v}"
-            )
-
-            # Optional notes
-            st.markdown("---")
-            notes_default = ''
-            if previous_coding:
-                notes_val = previous_coding.get('notes', '')
-                if isinstance(notes_val, str) and pd.notna(notes_val):
-                    notes_default = notes_val
-            
-            # IMPORTANT: Widget key includes version number
-            notes = st.text_area(
-                "Notes (optional):",
-                value=notes_default,
-                max_chars=500,
-                key=f"notes_{current_index}_v{v}",
-                help="Any observations or issues with this argument"
-            )
-
-            # Classification guide
-            with st.expander("📖 Classification Guide"):
-                st.markdown("""
-                **STEEP**: The speaker indicates labor market conditions
-                SIGNIFICANTLY affect inflation.
-                - Causal language: "drives", "causes", "leads to"
-                - Concern: "will feed into", "translate to"
-                - Example: "Tight labor markets are driving wage pressures
-                  that will feed into core inflation"
-
-                **FLAT**: The speaker indicates labor markets have
-                LITTLE or NO effect on inflation.
-                - Disconnection: "despite", "hasn't translated"
-                - Skepticism: "broken", "dead", "no longer valid"
-                - Example: "Despite unemployment below 4%, we've seen
-                  no acceleration in inflation"
-
-                **MODERATE**: The speaker indicates a QUALIFIED or
-                PARTIAL relationship.
-                - Hedging: "some", "modest", "limited"
-                - Example: "Tight labor may generate some inflation
-                  pressure, but effects are modest"
-
-                **NONE** (default): No Phillips curve belief expressed.
-                - Mentions labor OR inflation, but not both
-                - Mentions both but no causal connection
-                - Pure description without interpreting relationship
-                """)
-
-        # Navigation
-        st.markdown("---")
-        col_prev, col_save, col_next, col_jump = st.columns([1, 2, 1, 2])
-
-        with col_prev:
-            if st.button("◀ Previous", disabled=(current_index == 0), use_container_width=True):
-                st.session_state.current_index -= 1
-                st.rerun()
-
-        with col_save:
-            if st.button("💾 Save & Continue", type="primary", use_container_width=True):
-                # Lock coder name on first save
-                if st.session_state.locked_coder_name is None:
-                    st.session_state.locked_coder_name = coder_name
-                
-                result = {
-                    'coding_id': coding_id,
-                    'coder_name': st.session_state.locked_coder_name,
-                    'classification': classification,
-                    'notes': notes,
-                    'coded_at': datetime.now().isoformat()
-                }
-
-                # Update or append
-                existing_idx = None
-                for i, r in enumerate(st.session_state.results):
-                    if r['coding_id'] == coding_id:
-                        existing_idx = i
-                        break
-
-                if existing_idx is not None:
-                    st.session_state.results[existing_idx] = result
-                else:
-                    st.session_state.results.append(result)
-
-                st.session_state.coded_ids.add(coding_id)
-
-                st.success(f"Saved! ({len(st.session_state.results)} total)")
-
-                # Move to next
-                if current_index < total_arguments - 1:
-                    st.session_state.current_index += 1
-                    st.rerun()
-
-        with col_next:
-            if st.button("Skip ▶", disabled=(current_index == total_arguments - 1), use_container_width=True):
-                st.session_state.current_index += 1
-                st.rerun()
-
-        with col_jump:
-            # IMPORTANT: Widget key includes version number
-            jump_to = st.number_input(
-                "Jump to:",
-                min_value=1,
-                max_value=total_arguments,
-                value=current_index + 1,
-                step=1,
-                key=f"jump_{current_index}_v{v}"
-            )
-            if st.button("Go", use_container_width=True):
-                st.session_state.current_index = jump_to - 1
-                st.rerun()
-
+        render_current_argument(coder_name, current_index, total_arguments)
     else:
         st.success("🎉 All arguments have been reviewed!")
-        st.info(f"Total coded: {len(st.session_state.coded_ids)} / {total_arguments}")
+        st.info(f"Total coded: {len(st.session_state.results_by_id)} / {total_arguments}")
 
         st.markdown("### Download your results:")
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe_name = coder_name.lower().replace(' ', '_')
-        filename = f"coded_{safe_name}_phillips_{timestamp}.csv"
+        filename = st.session_state.download_filename or make_download_filename(coder_name)
 
         st.download_button(
             label="📥 Download Results CSV",
-            data=get_results_csv(st.session_state.results),
+            data=get_cached_results_csv(),
             file_name=filename,
             mime="text/csv",
             type="primary"
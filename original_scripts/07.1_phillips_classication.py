@@ -1,13 +1,34 @@
 import common
 import pandas as pd
+import numpy as np
 import re
-import glob as glob
+import io
+import csv
+import os
 import os.path as path
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 READ_DIR = common.OUTPUT_DIR
 OUTPUT_DIR = common.PC_DATA_DIR
 BATCH_RUN_DECADE_DIR = common.PC_DATA_BATCH_RUN_DIR
 
+_BLOCK_RE = re.compile(r"<classification\b[^>]*>(.*)</classification>", re.IGNORECASE | re.DOTALL)
+_PC_RE = re.compile(r'<phillips_slope>\s*(.*?)\s*</phillips_slope>', re.IGNORECASE | re.DOTALL)
+_PC_IN_BLOCK_RE = re.compile(r'<classification\b[^>]*>.*?<phillips_slope>\s*(.*?)\s*</phillips_slope>',
+                             re.IGNORECASE | re.DOTALL)
+_REASONING_RE = re.compile(r'<reasoning>(.*?)</reasoning>', re.IGNORECASE | re.DOTALL)
+
+# phillips_slope label -> row of _SLOPE_LUT; unparsed/unknown labels fall back to 0 (NaN)
+_SLOPE_CODES = {'null': 0, 'steep': 1, 'flat': 2, 'moderate': 3}
+_SLOPE_LUT = np.array([np.nan, 1, -1, 0], dtype=np.float32)
+
+# Field patterns for parse_classification_output (non-greedy, case-insensitive, dot matches newlines)
+_FIELD_PATTERNS = {
+    'phillips_slope': _PC_RE,
+    'reasoning':      _REASONING_RE,
+}
+
 
 def get_argument_df():
     filepath = f'{READ_DIR}/all_arguments.pkl'
@@ -189,10 +210,30 @@ def get_all_prompts_by_decade(decade, argument_df=None):
     
     argument_df = argument_df[argument_df.ymd.str.startswith(str(decade))]
     
-    prompts = {rownum: get_prompt(argument_df.loc[[rownum]][['quotation', 'description', 'explanation']].to_csv()) for rownum in argument_df.index}
+    prompts = {rownum: get_prompt(row_csv) for rownum, row_csv in
+               _rows_to_csv(argument_df, ['quotation', 'description', 'explanation']).items()}
     return prompts
 
 
+def _rows_to_csv(df, cols):
+    """
+    Serialize each row as its own one-row CSV, keyed by index.
+
+    Produces the same text as df.loc[[rownum]][cols].to_csv() without slicing
+    and writing a DataFrame per row, so prompts (and prompt caches) are unchanged.
+    """
+    header = ',' + ','.join(cols) + '\n'
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    rows = {}
+    for row in df[cols].fillna('').itertuples(name=None):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(row)
+        rows[row[0]] = header + buf.getvalue()
+    return rows
+
+
 def run_all_prompts_by_decade(decade):
     return common.run_all_prompts(lambda: get_all_prompts_by_decade(decade), output_dir=f'{BATCH_RUN_DECADE_DIR}/{decade}', 
                                   caching=True)
@@ -213,48 +254,71 @@ def parse_classification_output(text):
         pd.Series: Parsed classification data with 'phillips_slope' and 'reasoning' fields
     """
     # If a <classification>...</classification> block exists, focus on it
-    m_block = re.search(r"<classification\b[^>]*>(.*)</classification>",
-                        text, flags=re.IGNORECASE | re.DOTALL)
+    m_block = _BLOCK_RE.search(text)
     if m_block:
         text = m_block.group(1)
     
-    # Define regex patterns for each field (non-greedy, case-insensitive, dot matches newlines)
-    patterns = {
-        'phillips_slope': r'<phillips_slope>(.*?)</phillips_slope>',
-        'reasoning':      r'<reasoning>(.*?)</reasoning>',
-    }
-    
-    # Extract values using regex
+    # Extract values using the precompiled field patterns
     extracted_values = {}
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text, flags=re.IGNORECASE | re.DOTALL)
+    for field, pattern in _FIELD_PATTERNS.items():
+        match = pattern.search(text)
         extracted_values[field] = match.group(1).strip() if match else None
     
     # Return as pandas Series (order preserved from the dict)
     return pd.Series(extracted_values)
 
 
+def _iter_txt(root):
+    """Yield (rownum, path, mtime_ns) for every <root>/<decade>/<rownum>.txt output file."""
+    for decade in os.scandir(root):
+        if decade.is_dir():
+            for entry in os.scandir(decade.path):
+                if entry.name.endswith('.txt'):
+                    yield int(entry.name[:-4]), entry.path, entry.stat().st_mtime_ns
+
+
+def _extract_slopes(entries):
+    """Read the given output files and return their raw phillips_slope strings indexed by rownum."""
+    # Reads are I/O-bound small files; overlap them across threads
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        contents = list(ex.map(lambda e: Path(e[1]).read_bytes().decode('utf-8'), entries))
+    texts = pd.Series(contents, index=[e[0] for e in entries], dtype=object)
+
+    # Vectorized extract: slope inside the <classification> block, else anywhere in the text
+    slopes = texts.str.extract(_PC_IN_BLOCK_RE, expand=False)
+    no_block = slopes.isna()
+    slopes[no_block] = texts[no_block].str.extract(_PC_RE, expand=False)
+    return slopes
+
+
+def _slopes_to_values(slopes):
+    """Map raw slope labels to steep=1, flat=-1, moderate=0, null=NaN via a lookup array."""
+    codes = slopes.map(_SLOPE_CODES).fillna(0).to_numpy(dtype=np.int8)
+    return pd.Series(_SLOPE_LUT[codes], index=slopes.index)
+
+
 def parse_all_classification_output():
     filepath = f'{OUTPUT_DIR}/phillips_classifications.pkl'
-    if path.isfile(filepath):
+    # {rownum: (mtime_ns, slope)} so only new or modified output files are re-parsed
+    state_path = f'{OUTPUT_DIR}/phillips_classifications_state.pkl'
+    state = pd.read_pickle(state_path) if path.isfile(state_path) else {}
+
+    entries = list(_iter_txt(OUTPUT_DIR))
+    stale = [e for e in entries if state.get(e[0], (None,))[0] != e[2]]
+    removed = state.keys() - {e[0] for e in entries}
+
+    if not stale and not removed and path.isfile(filepath):
         return pd.read_pickle(filepath)
 
-    phillips_map = {
-        'null': np.nan,
-        'steep': 1,
-        'flat': -1,
-        'moderate': 0
-    }
-
-    result = dict()
-    files = glob.glob(f'{OUTPUT_DIR}/*/*.txt')
-    for f in files:
-        text = open(f).read()
-        classification = parse_classification_output(text)
-        rownum = f.split('/')[-1].replace('.txt', '')
-        result[int(rownum)] = phillips_map[classification['phillips_slope']]
-
-    result = pd.Series(result).T
+    if stale:
+        slopes = _slopes_to_values(_extract_slopes(stale))
+        for (rownum, _, mtime_ns), slope in zip(stale, slopes):
+            state[rownum] = (mtime_ns, slope)
+    for rownum in removed:
+        del state[rownum]
+    pd.to_pickle(state, state_path)
+
+    result = pd.Series({rownum: state[rownum][1] for rownum, _, _ in entries}, dtype='float32')
     pd.to_pickle(result, filepath)
     return result
 
@@ -2,22 +2,55 @@ import common
 import pandas as pd
 import numpy as np
 import re
-import glob as glob
+import io
+import csv
+import os
 import os.path as path
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 READ_DIR = common.OUTPUT_DIR
 OUTPUT_DIR = common.STOCK_WEALTH_DATA_DIR
 BATCH_RUN_DECADE_DIR = common.STOCK_WEALTH_DATA_BATCH_RUN_DIR
 
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
 
-def get_argument_df():
-    filepath = f'{READ_DIR}/all_arguments.pkl'
-    df = pd.read_pickle(filepath)
-    return df[df.variable.isin(['Growth', 'Employment', 'Stock Market', 'Credit Markets'])]
+_BLOCK_RE = re.compile(r"<classification\b[^>]*>(.*)</classification>", re.IGNORECASE | re.DOTALL)
 
+# Single pass over the output: wealth_effect, then (optionally) the reasoning that follows it.
+_PAT = re.compile(r"<wealth_effect>(?P<we>.*?)</wealth_effect>(?:.*?<reasoning>(?P<rs>.*?)</reasoning>)?",
+                  re.IGNORECASE | re.DOTALL)
 
-def get_prompt(argument):
-    prompt_1 = f"""
+
+@lru_cache(maxsize=1)
+def get_argument_df():
+    # Memoized: callers must not mutate the returned frame (copy it first)
+    filepath = f'{READ_DIR}/all_arguments.pkl'
+    parquet_path = filepath.replace('.pkl', '.parquet')
+    if not PYARROW_AVAILABLE:
+        df = pd.read_pickle(filepath)
+    elif path.isfile(parquet_path) and path.getmtime(parquet_path) >= path.getmtime(filepath):
+        df = pd.read_parquet(parquet_path, engine='pyarrow')
+    else:
+        # One-time migration; rewritten whenever the pickle is newer
+        df = pd.read_pickle(filepath)
+        df['variable'] = df['variable'].astype('category')
+        df.to_parquet(parquet_path, engine='pyarrow')
+
+    if PYARROW_AVAILABLE:
+        # Arrow-backed strings so the per-decade ymd prefix filter runs in Arrow kernels
+        df['ymd'] = df['ymd'].astype('string[pyarrow]')
+
+    # Filter on the small integer category codes rather than comparing strings per row
+    if not isinstance(df['variable'].dtype, pd.CategoricalDtype):
+        df['variable'] = df['variable'].astype('category')
+    wanted = df['variable'].cat.categories.get_indexer(['Growth', 'Employment', 'Stock Market', 'Credit Markets'])
+    return df[np.isin(df['variable'].cat.codes.to_numpy(), wanted[wanted >= 0])]
+
+
+# Identical for every argument, so it is built once and sent as a byte-identical prefix.
+_SYSTEM_PROMPT = """
     You are tasked with extracting and classifying stock market wealth effect beliefs from Federal Open Market Committee (FOMC) speaker statements. The stock market wealth effect describes the economic mechanism whereby changes in equity prices affect household wealth, consumption behavior, and broader macroeconomic outcomes.
 
     ## Your Task
@@ -199,6 +232,8 @@ def get_prompt(argument):
     - Distinguish between responding to "financial conditions" broadly vs. specifically believing in stock market wealth effects
     - Your XML output must be well-formed and machine-readable"""
 
+
+def get_prompt(argument):
     prompt_2 = f"""
     Here is the economic argument you need to analyze:
     <economic_argument>
@@ -206,19 +241,45 @@ def get_prompt(argument):
     </economic_argument>
     """
 
-    return prompt_1, prompt_2
+    return _SYSTEM_PROMPT, prompt_2
+
+
+@lru_cache(maxsize=None)
+def _decade_groups(width):
+    """Split get_argument_df() once by the first `width` characters of ymd."""
+    df = get_argument_df()
+    return {prefix: group for prefix, group in df.groupby(df['ymd'].str[:width])}
 
 
 def get_all_prompts_by_decade(decade, argument_df=None):
     if argument_df is None:
-        argument_df = get_argument_df()
-    
-    argument_df = argument_df[argument_df.ymd.str.startswith(str(decade))]
+        # One ymd scan shared by every decade instead of one per call
+        groups = _decade_groups(len(str(decade)))
+        if str(decade) not in groups:
+            return {}
+        argument_df = groups[str(decade)]
+    else:
+        argument_df = argument_df[argument_df.ymd.str.startswith(str(decade))]
     
-    prompts = {rownum: get_prompt(argument_df.loc[[rownum]][['quotation', 'description', 'explanation']].to_csv()) for rownum in argument_df.index}
+    prompts = {rownum: get_prompt(argument) for rownum, argument in
+               _rows_to_csv(argument_df, ['quotation', 'description', 'explanation']).items()}
     return prompts
 
 
+def _rows_to_csv(df, cols):
+    """Map each rownum to the text df.loc[[rownum]][cols].to_csv() would give, so cached prompts still match."""
+    header = ',' + ','.join(cols) + '\n'
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    lines = {}
+    for rownum, *values in df[cols].fillna('').itertuples(name=None):
+        writer.writerow((rownum, *values))
+        lines[rownum] = header + out.getvalue()
+        out.seek(0)
+        out.truncate()
+    return lines
+
+
 def run_all_prompts_by_decade(decade):
     return common.run_all_prompts(lambda: get_all_prompts_by_decade(decade), output_dir=f'{BATCH_RUN_DECADE_DIR}/{decade}', 
                                   caching=True)
@@ -228,6 +289,27 @@ def save_all_prompts_by_decade(decade, id_mapping, submitted_requests):
     return common.save_submitted_request_responses_meeting(id_mapping, submitted_requests, output_dir=f'{OUTPUT_DIR}/{decade}',)
 
 
+def _classification_block(text):
+    """Return the inside of the <classification>...</classification> block, or text if there is none."""
+    # Case-folded find/rfind with the same semantics as _BLOCK_RE (case-insensitive, \b after
+    # the tag name, first opening tag to last closing tag) without starting the regex engine
+    folded = text.lower()
+    if len(folded) != len(text):
+        # Lowercasing moved offsets (a few non-ASCII characters do): use the regex itself
+        match = _BLOCK_RE.search(text)
+        return match.group(1) if match else text
+
+    j = folded.rfind('</classification>')
+    i = folded.find('<classification')
+    while 0 <= i < j:
+        end = i + len('<classification')
+        if not (folded[end].isalnum() or folded[end] == '_'):
+            k = folded.find('>', end)
+            return text[k + 1:j] if 0 <= k < j else text
+        i = folded.find('<classification', end)
+    return text
+
+
 def parse_classification_output(text):
     """
     Parse stock market wealth effect classification output using regular expressions and return a pandas Series.
@@ -238,31 +320,40 @@ def parse_classification_output(text):
     Returns:
         pd.Series: Parsed classification data with 'wealth_effect' and 'reasoning' fields
     """
-    # If a <classification>...</classification> block exists, focus on it
-    m_block = re.search(r"<classification\b[^>]*>(.*)</classification>",
-                        text, flags=re.IGNORECASE | re.DOTALL)
-    if m_block:
-        text = m_block.group(1)
-    
-    # Define regex patterns for each field (non-greedy, case-insensitive, dot matches newlines)
-    patterns = {
-        'wealth_effect': r'<wealth_effect>(.*?)</wealth_effect>',
-        'reasoning':     r'<reasoning>(.*?)</reasoning>',
-    }
-    
-    # Extract values using regex
-    extracted_values = {}
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text, flags=re.IGNORECASE | re.DOTALL)
-        extracted_values[field] = match.group(1).strip() if match else None
+    match = _PAT.search(_classification_block(text))
+    wealth_effect = match.group('we') if match else None
+    reasoning = match.group('rs') if match else None
     
     # Return as pandas Series (order preserved from the dict)
-    return pd.Series(extracted_values)
+    return pd.Series({
+        'wealth_effect': wealth_effect.strip() if wealth_effect is not None else None,
+        'reasoning':     reasoning.strip() if reasoning is not None else None,
+    })
+
+
+def _iter_txt(root):
+    """Yield (rownum, path) for every <root>/<decade>/<rownum>.txt output file."""
+    for decade in os.scandir(root):
+        if decade.is_dir():
+            for entry in os.scandir(decade.path):
+                if entry.name.endswith('.txt'):
+                    yield int(entry.name[:-4]), entry.path
+
+
+def _read_output(entry):
+    """Read one (rownum, path) output; called from a thread pool since the cost is open/read latency."""
+    rownum, f = entry
+    with open(f) as fh:
+        return rownum, fh.read()
 
 
 def parse_all_classification_output(use_cache=False):
     filepath = f'{OUTPUT_DIR}/stock_market_wealth_classifications.pkl'
+    if PYARROW_AVAILABLE:
+        filepath = filepath.replace('.pkl', '.parquet')
     if path.isfile(filepath) and use_cache:
+        if PYARROW_AVAILABLE:
+            return pd.read_parquet(filepath, engine='pyarrow')['wealth_effect']
         return pd.read_pickle(filepath)
 
     wealth_effect_map = {
@@ -272,25 +363,32 @@ def parse_all_classification_output(use_cache=False):
         'moderate': 0
     }
 
-    result = dict()
-    files = glob.glob(f'{OUTPUT_DIR}/*/*.txt')
-    for f in files:
-        text = open(f).read()
-        classification = parse_classification_output(text)
-        rownum = f.split('/')[-1].replace('.txt', '')
-        wealth_effect_value = classification['wealth_effect']
-        if wealth_effect_value:
-            wealth_effect_value = wealth_effect_value.lower()
-        result[int(rownum)] = wealth_effect_map.get(wealth_effect_value, np.nan)
-
-    result = pd.Series(result).T
-    pd.to_pickle(result, filepath)
+    entries = list(_iter_txt(OUTPUT_DIR))
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        texts = list(ex.map(_read_output, entries))
+
+    # Fill preallocated arrays in one pass over the texts
+    n = len(texts)
+    rownums = np.empty(n, dtype=np.int64)
+    labels = np.empty(n, dtype=object)
+    for i, (rownum, text) in enumerate(texts):
+        match = _PAT.search(_classification_block(text))
+        rownums[i] = rownum
+        labels[i] = match.group('we') if match else None
+    values = pd.Series(labels, index=rownums)
+
+    # Labels outside the map (and missing matches) become NaN
+    result = values.str.strip().str.lower().map(wealth_effect_map).astype('float32')
+    if PYARROW_AVAILABLE:
+        result.to_frame('wealth_effect').to_parquet(filepath, engine='pyarrow')
+    else:
+        pd.to_pickle(result, filepath)
     return result
 
 
 def read_arguments_with_classification_output():
     filepath = f'{OUTPUT_DIR}/wealth_arguments_with_classification.pkl'
-    arguments = get_argument_df()
+    arguments = get_argument_df().copy()
     wealth_effect = parse_all_classification_output()
     arguments['wealth_effect'] = wealth_effect
     arguments['ymd'] = pd.to_datetime(arguments['ymd'])
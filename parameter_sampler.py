@@ -19,9 +19,11 @@ Key differences from argument sampling:
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import json
 from datetime import datetime
 
+from sample_io import write_csv, write_json
+
+
 class ParameterSampler:
     """
     Creates structured random samples of model parameters for human validation
@@ -71,11 +73,13 @@ class ParameterSampler:
         parameter_type : str, optional
             If provided, filter to specific parameter type
         """
-        df_clean = df.copy()
+        # No up-front copy: the filters below already return new frames, and
+        # callers only sample from the result
+        df_clean = df
 
         # Filter by parameter type if specified
         if parameter_type and 'parameter_type' in df_clean.columns:
-            df_clean = df_clean[df_clean['parameter_type'] == parameter_type]
+            df_clean = df_clean[df_clean['parameter_type'].values == parameter_type]
 
         # Remove rows with missing estimates
         estimate_cols = [col for col in df_clean.columns if 'estimate' in col.lower() or 'value' in col.lower()]
@@ -134,15 +138,22 @@ class ParameterSampler:
 
         # Group and sample proportionally
         grouped = df.groupby(stratify_by)
-        n_groups = len(grouped)
+        n_groups = grouped.ngroups
+        # ngroup() is NaN for rows whose keys are missing; mark those -1
+        group_codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
         n_per_group = max(1, target_n // n_groups)
 
-        samples = []
-        for name, group in grouped:
-            n_sample = min(n_per_group, len(group))
-            samples.append(group.sample(n=n_sample, random_state=self.seed))
+        # Row positions of each group, in group order (rows with missing keys are left out)
+        order = np.argsort(group_codes, kind='stable')
+        order = order[group_codes[order] >= 0]
+        group_positions = np.split(order, np.cumsum(np.bincount(group_codes[order], minlength=n_groups))[:-1])
+
+        # RandomState(seed) per group draws the same permutation group.sample(n, random_state=seed)
+        # did, so a seed keeps selecting the same rows; then one positional take
+        picks = [positions[np.random.RandomState(self.seed).permutation(len(positions))[:n_per_group]]
+                 for positions in group_positions]
 
-        return pd.concat(samples, ignore_index=True)
+        return df.iloc[np.concatenate(picks)].reset_index(drop=True)
 
     def calculate_summary_stats(self, sample_df):
         """
@@ -153,19 +164,19 @@ class ParameterSampler:
             'timestamp': datetime.now().isoformat()
         }
 
-        # Numeric columns statistics
+        # Numeric columns statistics, all aggregates in a single .agg call
         numeric_cols = sample_df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            if 'estimate' in col.lower() or 'value' in col.lower():
-                stats[f'{col}_mean'] = sample_df[col].mean()
-                stats[f'{col}_std'] = sample_df[col].std()
-                stats[f'{col}_min'] = sample_df[col].min()
-                stats[f'{col}_max'] = sample_df[col].max()
+        est_cols = [col for col in numeric_cols if 'estimate' in col.lower() or 'value' in col.lower()]
+        if est_cols:
+            agg = sample_df[est_cols].agg(['mean', 'std', 'min', 'max'])
+            for col in est_cols:
+                for metric in ('mean', 'std', 'min', 'max'):
+                    stats[f'{col}_{metric}'] = agg.at[metric, col]
 
         return stats
 
     def create_coding_files(self, sample_df, parameter_type, output_dir='validation_samples/production',
-                           context_columns=None, llm_estimate_column='llm_estimate'):
+                           context_columns=None, llm_estimate_column='llm_estimate', stats=None):
         """
         Create files for human coding
 
@@ -181,12 +192,16 @@ class ParameterSampler:
             Columns to include as context for human coders
         llm_estimate_column : str
             Column name containing LLM estimates
+        stats : dict, optional
+            Summary statistics already returned by sample_parameters; computed here if omitted
         """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        # Shuffle for coding
-        sample_shuffled = sample_df.sample(frac=1, random_state=self.seed+1000).reset_index(drop=True)
+        # Shuffle for coding: one positional take of a permuted index (same order as
+        # sample(frac=1, random_state=seed+1000), which draws the same RandomState permutation)
+        perm = np.random.RandomState(self.seed + 1000).permutation(len(sample_df))
+        sample_shuffled = sample_df.iloc[perm].reset_index(drop=True)
 
         # Create coding IDs
         coding_ids = [f'CODE_{parameter_type}_{str(i).zfill(4)}' for i in range(len(sample_shuffled))]
@@ -202,7 +217,7 @@ class ParameterSampler:
 
         coding_df = pd.DataFrame(coding_data)
         coding_file = output_path / f'coding_{parameter_type.lower()}.csv'
-        coding_df.to_csv(coding_file, index=False)
+        write_csv(coding_df, coding_file)
 
         # Create validation key (includes LLM estimates - hidden from coders)
         key_data = {
@@ -218,13 +233,14 @@ class ParameterSampler:
 
         key_df = pd.DataFrame(key_data)
         key_file = output_path / f'key_{parameter_type.lower()}.csv'
-        key_df.to_csv(key_file, index=False)
+        write_csv(key_df, key_file)
 
         # Save summary statistics
-        stats = self.calculate_summary_stats(sample_shuffled)
+        # Shuffling doesn't change the aggregates, so stats from sample_parameters can be reused
+        if stats is None:
+            stats = self.calculate_summary_stats(sample_df)
         stats_file = output_path / f'stats_{parameter_type.lower()}.json'
-        with open(stats_file, 'w') as f:
-            json.dump(stats, f, indent=2, default=str)
+        write_json(stats, stats_file)
 
         print(f"\nFiles created:")
         print(f"  Coding file: {coding_file}")
@@ -240,4 +256,4 @@ if __name__ == "__main__":
     print("\nExample usage:")
     print("  sampler = ParameterSampler('llm_estimates.csv', seed=42)")
     print("  sample_df, stats = sampler.sample_parameters('phillips_curve', target_n=100)")
-    print("  sampler.create_coding_files(sample_df, 'phillips_curve')")
+    print("  sampler.create_coding_files(sample_df, 'phillips_curve', stats=stats)")
@@ -15,9 +15,117 @@ Sampling Strategy:
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import hashlib
+import importlib.util
 import json
+import os
 from datetime import datetime
 
+from sample_io import write_csv
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Economic variables the Phillips curve classification covers
+PC_VARIABLES = ['Growth', 'Inflation', 'Employment']
+
+# Claude classification labels, in sampling order
+PC_CATEGORIES = ['steep', 'flat', 'moderate', 'none']
+
+# Argument fields used by sampling and the coding/key files
+ARGUMENT_COLUMNS = ['variable', 'quotation', 'description', 'explanation', 'stablespeaker', 'ymd']
+
+# Quotations shorter than this are dropped before sampling
+MIN_QUOTATION_LENGTH = 10
+
+# Part of the prepared-arguments cache key: bump whenever _prepare_args changes its output
+ARGS_CACHE_VERSION = '1'
+
+# Feather cannot store a non-default index, so it is kept as a regular column
+FEATHER_INDEX_COLUMN = '__index__'
+
+
+def convert_to_feather(pickle_path):
+    """
+    One-time conversion of a pickled DataFrame/Series to an uncompressed Feather sibling.
+
+    Uncompressed Feather is the fastest format to read back; _load_frame picks it up
+    automatically while it is newer than the pickle.
+    """
+    obj = pd.read_pickle(pickle_path)
+    if isinstance(obj, pd.Series):
+        obj = obj.to_frame(obj.name if obj.name is not None else 'value')
+    feather_path = Path(pickle_path).with_suffix('.feather')
+    obj.rename_axis(FEATHER_INDEX_COLUMN).reset_index().to_feather(feather_path, compression='uncompressed')
+    return feather_path
+
+
+def _min_length_mask(strings, min_length):
+    """
+    Boolean mask of entries with at least min_length characters (missing values are False).
+
+    Uses pyarrow's utf8_length kernel when available instead of calling len() per element.
+    """
+    if PYARROW_AVAILABLE:
+        import pyarrow as pa
+        import pyarrow.compute as pa_compute
+
+        try:
+            arr = pa.array(strings.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass  # non-string values: use the pandas path below
+        else:
+            mask = pa_compute.greater_equal(pa_compute.utf8_length(arr), min_length)
+            return pa_compute.fill_null(mask, False).to_numpy(zero_copy_only=False)
+    return (strings.str.len() >= min_length).to_numpy()
+
+
+def _args_cache_path(arguments_path, classifications_path):
+    """Feather cache file for the prepared arguments, named after the preparation and its inputs."""
+    key = ':'.join([ARGS_CACHE_VERSION, *PC_VARIABLES, *PC_CATEGORIES, str(MIN_QUOTATION_LENGTH)] +
+                   [f'{os.path.abspath(p)}={os.path.getmtime(p)}' for p in (arguments_path, classifications_path)])
+    digest = hashlib.md5(key.encode()).hexdigest()[:8]
+    return Path(arguments_path).parent / '.cache' / f'args_{digest}.feather'
+
+
+def _distribution(labels):
+    """Label -> count dict; categorical labels are counted with one bincount over their codes."""
+    if isinstance(labels.dtype, pd.CategoricalDtype):
+        codes = labels.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels.cat.categories))
+        return dict(zip(labels.cat.categories, counts.tolist()))
+    return labels.value_counts().to_dict()
+
+
+def _load_frame(pickle_path, columns=None, variables=None):
+    """
+    Load a pickled frame, preferring an up-to-date .feather or .parquet sibling.
+
+    Columnar siblings are decoded multithreaded by pyarrow and only `columns` are read;
+    the pickle (always read in full) is the fallback. Rows are restricted to `variables`
+    in the Feather scan (which carries the index as a column) and after loading otherwise,
+    since a filtered Parquet read would renumber a stored RangeIndex.
+    """
+    df = None
+    if PYARROW_AVAILABLE and os.path.isfile(pickle_path):
+        import pyarrow.dataset as ds
+
+        pickle_mtime = os.path.getmtime(pickle_path)
+        feather_path = Path(pickle_path).with_suffix('.feather')
+        if feather_path.is_file() and os.path.getmtime(feather_path) >= pickle_mtime:
+            read_columns = None if columns is None else [FEATHER_INDEX_COLUMN] + columns
+            row_filter = ds.field('variable').isin(variables) if variables else None
+            table = ds.dataset(feather_path, format='feather').to_table(columns=read_columns, filter=row_filter)
+            return table.to_pandas().set_index(FEATHER_INDEX_COLUMN).rename_axis(None)
+        parquet_path = Path(pickle_path).with_suffix('.parquet')
+        if parquet_path.is_file() and os.path.getmtime(parquet_path) >= pickle_mtime:
+            df = pd.read_parquet(parquet_path, engine='pyarrow', columns=columns)
+
+    if df is None:
+        df = pd.read_pickle(pickle_path)
+    if variables:
+        df = df[df['variable'].isin(variables)].copy()
+    return df
+
 
 class PhillipsSampler:
     """
@@ -42,30 +150,55 @@ class PhillipsSampler:
         self.seed = seed
         np.random.seed(seed)
 
-        # Load arguments
-        self.args = pd.read_pickle(arguments_path)
+        # Prepared arguments are cached as Feather, keyed on the input files' modification times
+        cache_file = _args_cache_path(arguments_path, classifications_path) if PYARROW_AVAILABLE else None
+        if cache_file is not None and cache_file.is_file():
+            self.args = pd.read_feather(cache_file).set_index(FEATHER_INDEX_COLUMN).rename_axis(None)
+        else:
+            self.args = self._prepare_args(arguments_path, classifications_path)
+            if cache_file is not None:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                # Older entries can never be hit again (their inputs or version changed)
+                for stale in cache_file.parent.glob('args_*.feather'):
+                    stale.unlink()
+                self.args.rename_axis(FEATHER_INDEX_COLUMN).reset_index().to_feather(
+                    cache_file, compression='uncompressed')
+
+        print(f"Loaded {len(self.args)} valid arguments")
+        print(f"\nClaude classification distribution:")
+        print(self.args['claude_pc_category'].value_counts())
+
+        # Row positions per category, computed once for every sample_stratified call
+        codes = self.args['claude_pc_category'].cat.codes.to_numpy()
+        self._cat_index = {cat: np.flatnonzero(codes == k) for k, cat in enumerate(PC_CATEGORIES)}
 
-        # Filter to Phillips curve relevant variables
-        self.args = self.args[self.args['variable'].isin(['Growth', 'Inflation', 'Employment'])].copy()
+    def _prepare_args(self, arguments_path, classifications_path):
+        """
+        Load arguments and classifications, then filter and label them for sampling.
+        """
+        # Load arguments, filtered to Phillips curve relevant variables
+        args = _load_frame(arguments_path, columns=ARGUMENT_COLUMNS, variables=PC_VARIABLES)
 
         # Load and merge classifications
-        pc = pd.read_pickle(classifications_path)
-        self.args['claude_pc_slope'] = pc
-        self.args['claude_pc_category'] = self.args['claude_pc_slope'].map({
+        pc = _load_frame(classifications_path)
+        if isinstance(pc, pd.DataFrame):
+            pc = pc.iloc[:, 0]
+        args['claude_pc_slope'] = pc
+        args['claude_pc_category'] = args['claude_pc_slope'].map({
             1.0: 'steep',
             -1.0: 'flat',
             0.0: 'moderate'
         }).fillna('none')  # Use 'none' instead of 'null' to avoid CSV parsing issues
 
+        # Few distinct labels: categorical codes make the masks/value_counts integer work
+        args['claude_pc_category'] = pd.Categorical(args['claude_pc_category'], categories=PC_CATEGORIES)
+        args['variable'] = args['variable'].astype(pd.CategoricalDtype(PC_VARIABLES))
+
         # Store original index
-        self.args['original_index'] = self.args.index
+        args['original_index'] = args.index
 
         # Clean data - remove very short quotations
-        self.args = self.args[self.args['quotation'].str.len() >= 10]
-
-        print(f"Loaded {len(self.args)} valid arguments")
-        print(f"\nClaude classification distribution:")
-        print(self.args['claude_pc_category'].value_counts())
+        return args[_min_length_mask(args['quotation'], MIN_QUOTATION_LENGTH)]
 
     def sample_stratified(self, n_per_category=50):
         """
@@ -85,29 +218,31 @@ class PhillipsSampler:
         print(f"Stratified Sampling: {n_per_category} per category")
         print(f"{'='*60}")
 
-        samples = []
-        categories = ['steep', 'flat', 'moderate', 'none']
+        picks = []
+        categories = PC_CATEGORIES
 
+        # Sample row positions per category; the RandomState permutations are the ones
+        # DataFrame.sample(n=..., random_state=seed) draws, so a seed yields the same sample
         for cat in categories:
-            cat_args = self.args[self.args['claude_pc_category'] == cat]
-            n_available = len(cat_args)
+            positions = self._cat_index[cat]
+            n_available = positions.size
             n_sample = min(n_per_category, n_available)
 
-            sampled = cat_args.sample(n=n_sample, random_state=self.seed)
-            samples.append(sampled)
+            picks.append(positions[np.random.RandomState(self.seed).permutation(n_available)[:n_sample]])
 
             print(f"  {cat.upper()}: sampled {n_sample} / {n_available} available")
 
-        # Combine and shuffle
-        sample_df = pd.concat(samples, ignore_index=True)
-        sample_df = sample_df.sample(frac=1, random_state=self.seed + 1000).reset_index(drop=True)
+        # Combine and shuffle, then take all sampled rows in one positional lookup
+        picks = np.concatenate(picks)
+        picks = picks[np.random.RandomState(self.seed + 1000).permutation(picks.size)]
+        sample_df = self.args.iloc[picks].reset_index(drop=True)
 
         # Calculate statistics
         stats = {
             'total_sampled': len(sample_df),
             'n_per_category': n_per_category,
-            'category_distribution': sample_df['claude_pc_category'].value_counts().to_dict(),
-            'variable_distribution': sample_df['variable'].value_counts().to_dict(),
+            'category_distribution': _distribution(sample_df['claude_pc_category']),
+            'variable_distribution': _distribution(sample_df['variable']),
             'timestamp': datetime.now().isoformat(),
             'seed': self.seed
         }
@@ -130,7 +265,7 @@ class PhillipsSampler:
         output_path.mkdir(parents=True, exist_ok=True)
 
         # Create coding IDs
-        coding_ids = [f'PC_{str(i).zfill(4)}' for i in range(len(sample_df))]
+        coding_ids = np.char.add('PC_', np.char.zfill(np.arange(len(sample_df)).astype(str), 4))
 
         # === CODING FILE (for human coders - NO Claude classifications) ===
         coding_df = pd.DataFrame({
@@ -142,7 +277,7 @@ class PhillipsSampler:
         })
 
         coding_file = output_path / 'coding_phillips.csv'
-        coding_df.to_csv(coding_file, index=False)
+        write_csv(coding_df, coding_file)
 
         # === VALIDATION KEY (includes Claude classifications - hidden from coders) ===
         key_df = pd.DataFrame({
@@ -159,13 +294,13 @@ class PhillipsSampler:
         })
 
         key_file = output_path / 'key_phillips.csv'
-        key_df.to_csv(key_file, index=False)
+        write_csv(key_df, key_file)
 
         # === STATISTICS FILE ===
         stats = {
             'n_arguments': len(sample_df),
-            'category_distribution': sample_df['claude_pc_category'].value_counts().to_dict(),
-            'variable_distribution': sample_df['variable'].value_counts().to_dict(),
+            'category_distribution': _distribution(sample_df['claude_pc_category']),
+            'variable_distribution': _distribution(sample_df['variable']),
             'created_at': datetime.now().isoformat(),
             'seed': self.seed
         }
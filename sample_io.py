@@ -0,0 +1,42 @@
+# save as: sample_io.py
+
+"""
+Sample I/O
+==========
+File writers shared by the samplers. pyarrow and orjson are optional; without
+them the pandas and stdlib json writers are used.
+"""
+
+import importlib.util
+import json
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+ORJSON_AVAILABLE = importlib.util.find_spec('orjson') is not None
+
+
+def write_csv(df, path):
+    """Write df without its index via pyarrow's multithreaded CSV writer, else DataFrame.to_csv."""
+    if PYARROW_AVAILABLE:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pa_csv.write_csv(table, str(path), write_options=pa_csv.WriteOptions(batch_size=4096))
+            return
+        except pa.ArrowException:
+            pass  # column types the Arrow writer can't handle: use pandas below
+    df.to_csv(path, index=False)
+
+
+def write_json(obj, path):
+    """Write obj as indented JSON; orjson (when installed) serializes numpy scalars natively."""
+    if ORJSON_AVAILABLE:
+        import orjson
+
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, default=str,
+                                 option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=2, default=str)
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+pytest.importorskip('streamlit')
+
+from coding_interface import (get_results_csv, normalize_coding_df, read_csv_fast, read_results_file,
+                              validate_resume_csv)
+
+
+class _Upload(io.BytesIO):
+    def __init__(self, content, name):
+        super().__init__(content)
+        self.name = name
+
+
+def test_resume_matches_numeric_coding_ids():
+    coding_df = normalize_coding_df(read_csv_fast(io.BytesIO(
+        b'coding_id,quotation,description,explanation,variable\n'
+        b'101,q1,d1,e1,Growth\n102,q2,d2,e2,Inflation\n')))
+    resume_df = read_results_file(_Upload(
+        b'coding_id,coder_name,classification,notes,coded_at\n'
+        b'101,ann,steep,,2024-12-15T10:11:12.123456\n', 'coded_ann.csv'))
+
+    is_valid, _, matching_ids = validate_resume_csv(resume_df, set(coding_df['coding_id']))
+
+    assert is_valid and matching_ids == {101}
+    assert resume_df['coded_at'].tolist() == ['2024-12-15T10:11:12.123456']
+
+
+def test_results_csv_round_trips_through_resume():
+    results_by_id = {
+        101: {'coding_id': 101, 'coder_name': 'ann', 'classification': 'flat',
+              'notes': 'said "low", then\nrevised', 'coded_at': '2024-12-15T10:11:12.123456'},
+        102: {'coding_id': 102, 'coder_name': 'ann', 'classification': 'none',
+              'notes': '', 'coded_at': '2024-12-15T10:12:00.000001'},
+    }
+    content = get_results_csv(results_by_id)
+
+    resume_df = read_results_file(_Upload(content, 'coded_ann.csv'))
+
+    assert content.startswith(b'coding_id,coder_name,classification,notes,coded_at\n')
+    assert resume_df['coding_id'].tolist() == [101, 102]
+    assert resume_df['notes'].fillna('').tolist() == ['said "low", then\nrevised', '']
+    assert resume_df['coded_at'].tolist() == ['2024-12-15T10:11:12.123456', '2024-12-15T10:12:00.000001']
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from parameter_sampler import ParameterSampler
+
+
+def _loop_sample(df, target_n, stratify_by, seed):
+    """Reference: the original per-group sample + concat."""
+    grouped = df.groupby(stratify_by)
+    n_per_group = max(1, target_n // len(grouped))
+    return pd.concat([group.sample(n=min(n_per_group, len(group)), random_state=seed)
+                      for _, group in grouped], ignore_index=True)
+
+
+@pytest.mark.parametrize('target_n,stratify_by', [
+    (30, ['year']),                # every group can supply n_per_group rows
+    (300, ['year']),               # uneven: small groups give all their rows
+    (500, ['year', 'spec']),
+])
+def test_stratified_sample_matches_per_group_loop(target_n, stratify_by):
+    rng = np.random.RandomState(1)
+    df = pd.DataFrame({
+        'year': rng.choice([2001, 2002, 2003, np.nan], 200),
+        'spec': rng.choice(['a', 'b'], 200),
+        'estimate': rng.randn(200),
+    })
+    sampler = ParameterSampler.__new__(ParameterSampler)
+    sampler.seed = 42
+
+    pd.testing.assert_frame_equal(sampler._stratified_sample(df, target_n, stratify_by),
+                                  _loop_sample(df, target_n, stratify_by, seed=42))
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phillips_sampler import PhillipsSampler
+
+pytest.importorskip('pyarrow')
+
+
+def _write_inputs(directory):
+    """Arguments pickle with a RangeIndex (as in production) plus matching classifications."""
+    n = 120
+    rng = np.random.RandomState(0)
+    args = pd.DataFrame({
+        'variable': np.array(['Growth', 'Inflation', 'Employment', 'Stock Market'])[np.arange(n) % 4],
+        'quotation': [f'quotation number {i}' if i % 7 else 'short' for i in range(n)],
+        'description': [f'description {i}' for i in range(n)],
+        'explanation': [f'explanation {i}' for i in range(n)],
+        'stablespeaker': [f'speaker {i % 5}' for i in range(n)],
+        'ymd': [f'{1990 + i % 30}-01-01' for i in range(n)],
+    })
+    pc = pd.Series(rng.choice([1.0, -1.0, 0.0, np.nan], size=n), index=args.index)
+
+    arguments_path = directory / 'all_arguments.pkl'
+    classifications_path = directory / 'phillips_classifications.pkl'
+    args.to_pickle(arguments_path)
+    pc.to_pickle(classifications_path)
+    return args, arguments_path, classifications_path
+
+
+def _sample(arguments_path, classifications_path):
+    sampler = PhillipsSampler(str(arguments_path), str(classifications_path), seed=42)
+    sample_df, _ = sampler.sample_stratified(n_per_category=5)
+    return sampler, sample_df
+
+
+def test_parquet_sibling_matches_pickle(tmp_path):
+    pickle_dir = tmp_path / 'pickle'
+    parquet_dir = tmp_path / 'parquet'
+    pickle_dir.mkdir()
+    parquet_dir.mkdir()
+
+    _write_inputs(pickle_dir)
+    args, arguments_path, classifications_path = _write_inputs(parquet_dir)
+    # Same sibling 07.2 writes: categorical variable, RangeIndex stored as metadata
+    args = args.assign(variable=args['variable'].astype('category'))
+    parquet_path = arguments_path.with_suffix('.parquet')
+    args.to_parquet(parquet_path, engine='pyarrow')
+    mtime = os.path.getmtime(arguments_path) + 1
+    os.utime(parquet_path, (mtime, mtime))
+
+    from_pickle, pickle_sample = _sample(pickle_dir / 'all_arguments.pkl',
+                                         pickle_dir / 'phillips_classifications.pkl')
+    from_parquet, parquet_sample = _sample(arguments_path, classifications_path)
+
+    assert list(from_parquet.args.index) == list(from_pickle.args.index)
+    assert list(from_parquet.args['original_index']) == list(from_pickle.args['original_index'])
+    pd.testing.assert_series_equal(from_parquet.args['claude_pc_slope'], from_pickle.args['claude_pc_slope'])
+    for col in ['original_index', 'quotation', 'claude_pc_category', 'variable']:
+        assert list(parquet_sample[col]) == list(pickle_sample[col])
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import validation_analysis
+from validation_analysis import PhillipsValidationAnalyzer
+
+pytest.importorskip('pyarrow')
+
+
+def test_arrow_merge_matches_pandas_merge(tmp_path, monkeypatch):
+    key_file = tmp_path / 'key_phillips.csv'
+    pd.DataFrame({
+        'coding_id': ['PC_0000', 'PC_0001', 'PC_0002'],
+        'original_index': [5, 6, 7],
+        'claude_pc_category': ['steep', 'none', 'flat'],
+        'claude_pc_slope': [1.0, np.nan, -1.0],
+        'variable': ['Growth', 'Inflation', 'Employment'],
+        'stablespeaker': ['a', 'b', 'c'],
+        'ymd': [19991116, 20000101, 20010101],
+    }).to_csv(key_file, index=False)
+    human_df = pd.DataFrame({
+        'coding_id': ['PC_0002', 'PC_0000', 'PC_0001'],
+        'coder_name': ['x', 'x', 'y'],
+        'classification': ['flat', 'moderate', 'none'],
+    })
+    analyzer = PhillipsValidationAnalyzer()
+
+    from_arrow = analyzer.merge_with_claude(human_df, key_file)
+    monkeypatch.setattr(validation_analysis, 'PYARROW_AVAILABLE', False)
+    from_pandas = analyzer.merge_with_claude(human_df, key_file)
+
+    pd.testing.assert_frame_equal(from_arrow, from_pandas)
+    assert from_arrow['ymd'].dtype == np.int64
+
+
+@pytest.mark.filterwarnings('error')
+def test_weighted_kappa_same_for_categorical_and_object_labels():
+    merged = pd.DataFrame({
+        'classification': ['flat', 'moderate', 'steep', 'none', 'steep', 'flat'],
+        'claude_pc_category': ['flat', 'steep', 'steep', 'flat', 'moderate', 'flat'],
+    })
+    analyzer = PhillipsValidationAnalyzer()
+
+    from_object = analyzer.calculate_agreement_metrics(merged.copy())
+    analyzer._to_shared_categorical(merged, ['classification', 'claude_pc_category'])
+    from_categorical = analyzer.calculate_agreement_metrics(merged)
+
+    assert from_categorical['weighted_kappa'] == pytest.approx(from_object['weighted_kappa'])
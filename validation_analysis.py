@@ -18,14 +18,94 @@ import numpy as np
 from scipy import stats
 from pathlib import Path
 import glob
+import io
+import os
+from fnmatch import fnmatchcase
+import sys
+import importlib.util
 from sklearn.metrics import (
     cohen_kappa_score,
     confusion_matrix,
-    classification_report,
-    accuracy_score
+    classification_report
 )
+import matplotlib
+matplotlib.use('Agg')  # plots are only saved to files; no GUI toolkit needed
 import matplotlib.pyplot as plt
-import seaborn as sns
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Columns written by the coding interface; read as strings so files agree on types
+CODING_COLUMNS = ['coding_id', 'coder_name', 'classification', 'notes', 'coded_at']
+
+# Validation key columns joined onto the human codings
+KEY_COLUMNS = ['coding_id', 'claude_pc_category', 'claude_pc_slope', 'variable', 'stablespeaker', 'ymd']
+
+# Kappa interpretation bands: KAPPA_LABELS[i] covers [KAPPA_THRESHOLDS[i-1], KAPPA_THRESHOLDS[i])
+KAPPA_THRESHOLDS = np.array([0, 0.20, 0.40, 0.60, 0.80])
+KAPPA_LABELS = np.array([
+    'Less than chance agreement',
+    'Slight agreement',
+    'Fair agreement',
+    'Moderate agreement',
+    'Substantial agreement',
+    'Almost perfect agreement',
+])
+
+
+def _match_files(pattern):
+    """
+    Files matching a glob pattern whose wildcards are only in the file name.
+
+    Lists the directory once with os.scandir (type info comes with the entries, so no
+    per-file stat); patterns with wildcards in the directory part go through glob.
+    """
+    base, name_pattern = os.path.split(pattern)
+    if glob.has_magic(base):
+        return glob.glob(pattern)
+    try:
+        with os.scandir(base or '.') as entries:
+            # Like glob, hidden files only match patterns that start with '.'
+            return [os.path.join(base, entry.name) for entry in entries
+                    if fnmatchcase(entry.name, name_pattern) and entry.is_file()
+                    and (name_pattern.startswith('.') or not entry.name.startswith('.'))]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _label_codes(a, b):
+    """
+    Integer codes for two label Series over one shared set of labels.
+
+    Returns (codes_a, codes_b, n_labels); shared Categorical columns reuse their codes.
+    """
+    if isinstance(a.dtype, pd.CategoricalDtype) and a.dtype == b.dtype:
+        return a.cat.codes.to_numpy(), b.cat.codes.to_numpy(), len(a.cat.categories)
+    codes, uniques = pd.factorize(pd.concat([a, b], ignore_index=True))
+    return codes[:len(a)], codes[len(a):], len(uniques)
+
+
+def _ordinal_codes(labels, categories):
+    """Codes of labels over categories (-1 for any other label), re-coding Categoricals in place of re-wrapping them."""
+    if isinstance(labels.dtype, pd.CategoricalDtype):
+        return labels.cat.set_categories(categories).cat.codes.to_numpy()
+    return pd.Categorical(labels, categories=categories).codes
+
+
+def _kappa_and_accuracy(codes_a, codes_b, n_labels):
+    """
+    Unweighted Cohen's kappa and accuracy from non-missing integer label codes.
+
+    Builds the confusion matrix with one bincount and applies the closed form
+    (p_o - p_e) / (1 - p_e); matches sklearn's cohen_kappa_score/accuracy_score.
+    """
+    cm = np.bincount(codes_a.astype(np.int64) * n_labels + codes_b,
+                     minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+    n = cm.sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observed = np.trace(cm) / n
+        expected = (cm.sum(axis=1) @ cm.sum(axis=0)) / (n * n)
+        kappa = (observed - expected) / (1 - expected)
+    return float(kappa), float(observed)
 
 
 class PhillipsValidationAnalyzer:
@@ -35,6 +115,8 @@ class PhillipsValidationAnalyzer:
 
     def __init__(self):
         self.categories = ['steep', 'flat', 'moderate', 'none']
+        # Report sections write here; generate_report swaps in a buffer (None means stdout)
+        self._out = None
         # Numeric mapping for ordinal analysis
         self.category_to_numeric = {
             'steep': 1,
@@ -43,92 +125,151 @@ class PhillipsValidationAnalyzer:
             'none': np.nan
         }
 
+    def _print(self, *args):
+        """print() to the current report destination."""
+        print(*args, file=self._out if self._out is not None else sys.stdout)
+
     def load_human_coding(self, pattern='validation_samples/coded/coded_*_phillips_*.csv'):
         """
         Load all human coding files for Phillips curve.
         """
-        files = glob.glob(pattern)
+        files = _match_files(pattern)
 
         if not files:
             raise FileNotFoundError(f"No coding files found matching {pattern}")
 
-        dfs = []
-        for file in files:
-            df = pd.read_csv(file)
-            print(f"Loaded {len(df)} codings from {file}")
-            dfs.append(df)
+        if PYARROW_AVAILABLE:
+            all_codings = self._read_codings_arrow(files)
+        else:
+            dfs = []
+            for file in files:
+                df = pd.read_csv(file)
+                print(f"Loaded {len(df)} codings from {file}")
+                dfs.append(df)
 
-        all_codings = pd.concat(dfs, ignore_index=True)
+            all_codings = pd.concat(dfs, ignore_index=True)
 
         coders = all_codings['coder_name'].unique()
         print(f"\nFound {len(coders)} coders: {', '.join(coders)}")
 
         return all_codings
 
+    def _read_codings_arrow(self, files):
+        """
+        Parse coding CSVs with pyarrow's multithreaded reader and convert to pandas once.
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        # Empty notes would otherwise infer as a null column in some files; blanks become NaN like read_csv
+        convert_options = pa_csv.ConvertOptions(column_types={col: pa.string() for col in CODING_COLUMNS},
+                                                strings_can_be_null=True)
+        tables = []
+        for file in files:
+            table = pa_csv.read_csv(file, convert_options=convert_options)
+            print(f"Loaded {table.num_rows} codings from {file}")
+            tables.append(table)
+
+        try:
+            return pa.concat_tables(tables).to_pandas()
+        except pa.ArrowInvalid:
+            # Files disagree on some other column's schema: let pandas align them
+            return pd.concat([table.to_pandas() for table in tables], ignore_index=True)
+
     def merge_with_claude(self, human_df, key_file='validation_samples/production/key_phillips.csv'):
         """
         Merge human codings with Claude's classifications.
         """
         key_df = pd.read_csv(key_file)
 
-        merged = human_df.merge(
-            key_df[['coding_id', 'claude_pc_category', 'claude_pc_slope',
-                    'variable', 'stablespeaker', 'ymd']],
-            on='coding_id',
-            how='left'
-        )
+        merged = self._merge_arrow(human_df, key_df[KEY_COLUMNS]) if PYARROW_AVAILABLE else None
+        if merged is None:
+            merged = human_df.merge(
+                key_df[KEY_COLUMNS],
+                on='coding_id',
+                how='left'
+            )
+
+        # Few distinct labels: compare/group on categorical codes instead of strings
+        self._to_shared_categorical(merged, ['classification', 'claude_pc_category'])
 
         return merged
 
-    def calculate_agreement_metrics(self, merged_df, human_col='classification', claude_col='claude_pc_category'):
+    def _merge_arrow(self, human_df, key_df):
+        """
+        Left-join the key onto human codings with pyarrow's multithreaded hash join.
+
+        Keeps the human rows in their original order; returns None when the frames can't be
+        expressed as Arrow tables (or would clash on column names) so the pandas merge is used.
+        """
+        import pyarrow as pa
+
+        if set(human_df.columns) & set(KEY_COLUMNS[1:]):
+            return None  # pandas suffixes clashing columns; keep that behaviour
+
+        # key_df comes from pd.read_csv, so the joined columns keep the pandas merge's dtypes
+        try:
+            key = pa.Table.from_pandas(key_df, preserve_index=False)
+            human = pa.Table.from_pandas(human_df, preserve_index=False)
+            human = human.append_column('__row__', pa.array(np.arange(len(human_df))))
+            merged = human.join(key, keys='coding_id', join_type='left outer').sort_by('__row__')
+        except pa.ArrowException:
+            return None
+        return merged.select([col for col in merged.column_names if col != '__row__']).to_pandas()
+
+    def _to_shared_categorical(self, df, cols):
+        """
+        Cast cols in place to one Categorical dtype (known categories first, then any others).
+
+        A single dtype is required so the columns can still be compared with each other.
+        """
+        values = pd.unique(pd.concat([df[col] for col in cols]).dropna())
+        categories = self.categories + [v for v in values if v not in self.categories]
+        dtype = pd.CategoricalDtype(categories)
+        for col in cols:
+            df[col] = df[col].astype(dtype)
+
+    def calculate_agreement_metrics(self, merged_df, human_col='classification', claude_col='claude_pc_category',
+                                    prefiltered=False):
         """
         Calculate agreement metrics between human and Claude classifications.
         """
         # Remove rows where either classification is missing
-        valid = merged_df.dropna(subset=[human_col, claude_col])
+        valid = merged_df if prefiltered else merged_df.dropna(subset=[human_col, claude_col])
 
-        human_cats = valid[human_col].values
-        claude_cats = valid[claude_col].values
+        claude_codes, human_codes, n_labels = _label_codes(valid[claude_col], valid[human_col])
 
         n = len(valid)
-        print(f"\nAgreement metrics based on {n} arguments")
-
-        # Basic accuracy
-        accuracy = accuracy_score(claude_cats, human_cats)
+        self._print(f"\nAgreement metrics based on {n} arguments")
 
-        # Cohen's kappa (unweighted)
-        kappa = cohen_kappa_score(claude_cats, human_cats)
+        # Basic accuracy and Cohen's kappa (unweighted), from one confusion matrix
+        kappa, accuracy = _kappa_and_accuracy(claude_codes, human_codes, n_labels)
 
         # For non-none categories, calculate weighted kappa (ordinal)
         non_null_mask = (valid[human_col] != 'none') & (valid[claude_col] != 'none')
         if non_null_mask.sum() > 0:
             non_null = valid[non_null_mask]
-            # Map to ordinal for weighted kappa
-            human_ordinal = non_null[human_col].map({'flat': -1, 'moderate': 0, 'steep': 1})
-            claude_ordinal = non_null[claude_col].map({'flat': -1, 'moderate': 0, 'steep': 1})
-            weighted_kappa = cohen_kappa_score(claude_ordinal, human_ordinal, weights='linear')
+            # Ordinal codes for weighted kappa: category codes over flat < moderate < steep,
+            # shifted so flat=-1, moderate=0, steep=1 (unrecognised labels get -2 and are left out)
+            ordinal = ['flat', 'moderate', 'steep']
+            human_ordinal = _ordinal_codes(non_null[human_col], ordinal) - 1
+            claude_ordinal = _ordinal_codes(non_null[claude_col], ordinal) - 1
+            known = (human_ordinal >= -1) & (claude_ordinal >= -1)
+            if known.any():
+                weighted_kappa = cohen_kappa_score(claude_ordinal[known], human_ordinal[known], weights='linear')
+            else:
+                weighted_kappa = np.nan
         else:
             weighted_kappa = np.nan
 
-        print(f"\n=== AGREEMENT METRICS ===")
-        print(f"Accuracy: {accuracy:.3f} ({accuracy*100:.1f}%)")
-        print(f"Cohen's kappa (unweighted): {kappa:.3f}")
-        print(f"Cohen's kappa (weighted, non-null only): {weighted_kappa:.3f}")
+        self._print(f"\n=== AGREEMENT METRICS ===")
+        self._print(f"Accuracy: {accuracy:.3f} ({accuracy*100:.1f}%)")
+        self._print(f"Cohen's kappa (unweighted): {kappa:.3f}")
+        self._print(f"Cohen's kappa (weighted, non-null only): {weighted_kappa:.3f}")
 
         # Interpretation
-        print(f"\nKappa Interpretation:")
-        if kappa < 0:
-            print("  Less than chance agreement")
-        elif kappa < 0.20:
-            print("  Slight agreement")
-        elif kappa < 0.40:
-            print("  Fair agreement")
-        elif kappa < 0.60:
-            print("  Moderate agreement")
-        elif kappa < 0.80:
-            print("  Substantial agreement")
-        else:
-            print("  Almost perfect agreement")
+        self._print(f"\nKappa Interpretation:")
+        self._print(f"  {KAPPA_LABELS[np.searchsorted(KAPPA_THRESHOLDS, kappa, side='right')]}")
 
         return {
             'n': n,
@@ -137,42 +278,43 @@ class PhillipsValidationAnalyzer:
             'weighted_kappa': weighted_kappa
         }
 
-    def calculate_confusion_matrix(self, merged_df, human_col='classification', claude_col='claude_pc_category'):
+    def calculate_confusion_matrix(self, merged_df, human_col='classification', claude_col='claude_pc_category',
+                                   prefiltered=False):
         """
         Calculate and display confusion matrix.
         """
-        valid = merged_df.dropna(subset=[human_col, claude_col])
+        valid = merged_df if prefiltered else merged_df.dropna(subset=[human_col, claude_col])
 
         # Confusion matrix
         labels = ['steep', 'moderate', 'flat', 'none']
         cm = confusion_matrix(valid[claude_col], valid[human_col], labels=labels)
 
-        print(f"\n=== CONFUSION MATRIX ===")
-        print("(Rows: Claude, Columns: Human)")
-        print()
+        self._print(f"\n=== CONFUSION MATRIX ===")
+        self._print("(Rows: Claude, Columns: Human)")
+        self._print()
 
         # Pretty print
         header = "          " + "  ".join([f"{l:>8}" for l in labels])
-        print(header)
-        print("-" * len(header))
+        self._print(header)
+        self._print("-" * len(header))
 
         for i, label in enumerate(labels):
             row_str = f"{label:>8}  " + "  ".join([f"{cm[i,j]:>8}" for j in range(len(labels))])
-            print(row_str)
+            self._print(row_str)
 
         # Per-category metrics
-        print(f"\n=== PER-CATEGORY METRICS ===")
+        self._print(f"\n=== PER-CATEGORY METRICS ===")
         report = classification_report(valid[claude_col], valid[human_col],
                                       labels=labels, output_dict=True, zero_division=0)
 
         for label in labels:
             if label in report:
                 metrics = report[label]
-                print(f"\n{label.upper()}:")
-                print(f"  Precision: {metrics['precision']:.3f}")
-                print(f"  Recall: {metrics['recall']:.3f}")
-                print(f"  F1-score: {metrics['f1-score']:.3f}")
-                print(f"  Support: {metrics['support']}")
+                self._print(f"\n{label.upper()}:")
+                self._print(f"  Precision: {metrics['precision']:.3f}")
+                self._print(f"  Recall: {metrics['recall']:.3f}")
+                self._print(f"  F1-score: {metrics['f1-score']:.3f}")
+                self._print(f"  Support: {metrics['support']}")
 
         return cm, report
 
@@ -192,61 +334,66 @@ class PhillipsValidationAnalyzer:
         results = {}
         coders = multi_coded['coder_name'].unique()
 
+        # One coding_id x coder table instead of re-indexing each coder per pair
+        pivot = multi_coded.pivot_table(index='coding_id', columns='coder_name',
+                                        values='classification', aggfunc='first')
+        pivot = pivot.reindex(columns=coders)
+
         for i in range(len(coders)):
             for j in range(i+1, len(coders)):
                 coder1, coder2 = coders[i], coders[j]
 
-                coder1_df = multi_coded[multi_coded['coder_name'] == coder1].set_index('coding_id')
-                coder2_df = multi_coded[multi_coded['coder_name'] == coder2].set_index('coding_id')
+                a = pivot.iloc[:, i].to_numpy()
+                b = pivot.iloc[:, j].to_numpy()
+                overlap = ~(pd.isna(a) | pd.isna(b))
+                n_overlap = int(overlap.sum())
 
-                overlap_ids = coder1_df.index.intersection(coder2_df.index)
+                if n_overlap > 0:
+                    cats1 = a[overlap]
+                    cats2 = b[overlap]
 
-                if len(overlap_ids) > 0:
-                    cats1 = coder1_df.loc[overlap_ids, 'classification']
-                    cats2 = coder2_df.loc[overlap_ids, 'classification']
-
-                    kappa = cohen_kappa_score(cats1, cats2)
-                    accuracy = accuracy_score(cats1, cats2)
+                    kappa, accuracy = _kappa_and_accuracy(*_label_codes(pd.Series(cats1), pd.Series(cats2)))
 
                     results[f"{coder1}-{coder2}"] = {
-                        'n_overlap': len(overlap_ids),
+                        'n_overlap': n_overlap,
                         'kappa': kappa,
                         'accuracy': accuracy
                     }
 
-                    print(f"\n{coder1} vs {coder2} ({len(overlap_ids)} arguments):")
+                    print(f"\n{coder1} vs {coder2} ({n_overlap} arguments):")
                     print(f"  Cohen's kappa: {kappa:.3f}")
                     print(f"  Accuracy: {accuracy:.3f}")
 
         return results
 
-    def analyze_disagreements(self, merged_df, human_col='classification', claude_col='claude_pc_category'):
+    def analyze_disagreements(self, merged_df, human_col='classification', claude_col='claude_pc_category',
+                              prefiltered=False):
         """
         Analyze patterns in disagreements between human and Claude.
         """
-        valid = merged_df.dropna(subset=[human_col, claude_col])
+        valid = merged_df if prefiltered else merged_df.dropna(subset=[human_col, claude_col])
         disagreements = valid[valid[human_col] != valid[claude_col]]
 
-        print(f"\n=== DISAGREEMENT ANALYSIS ===")
-        print(f"Total disagreements: {len(disagreements)} / {len(valid)} ({100*len(disagreements)/len(valid):.1f}%)")
+        self._print(f"\n=== DISAGREEMENT ANALYSIS ===")
+        self._print(f"Total disagreements: {len(disagreements)} / {len(valid)} ({100*len(disagreements)/len(valid):.1f}%)")
 
         if len(disagreements) == 0:
             return None
 
         # Most common disagreement patterns
-        print(f"\nMost common disagreement patterns:")
-        patterns = disagreements.groupby([claude_col, human_col]).size().sort_values(ascending=False)
+        self._print(f"\nMost common disagreement patterns:")
+        patterns = disagreements.groupby([claude_col, human_col], observed=True).size().sort_values(ascending=False)
         for (claude_cat, human_cat), count in patterns.head(10).items():
-            print(f"  Claude: {claude_cat} -> Human: {human_cat}: {count}")
+            self._print(f"  Claude: {claude_cat} -> Human: {human_cat}: {count}")
 
         # Disagreements by variable
         if 'variable' in disagreements.columns:
-            print(f"\nDisagreements by economic variable:")
+            self._print(f"\nDisagreements by economic variable:")
             for var in disagreements['variable'].unique():
                 var_disagree = disagreements[disagreements['variable'] == var]
                 var_total = valid[valid['variable'] == var]
                 pct = 100 * len(var_disagree) / len(var_total) if len(var_total) > 0 else 0
-                print(f"  {var}: {len(var_disagree)} ({pct:.1f}%)")
+                self._print(f"  {var}: {len(var_disagree)} ({pct:.1f}%)")
 
         return disagreements
 
@@ -266,15 +413,13 @@ class PhillipsValidationAnalyzer:
         fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
         # Raw counts
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
-                   xticklabels=labels, yticklabels=labels, ax=axes[0])
+        self._annotated_heatmap(axes[0], cm, 'd', labels)
         axes[0].set_xlabel('Human Classification')
         axes[0].set_ylabel('Claude Classification')
         axes[0].set_title('Confusion Matrix (Counts)')
 
         # Normalized
-        sns.heatmap(cm_normalized, annot=True, fmt='.2f', cmap='Blues',
-                   xticklabels=labels, yticklabels=labels, ax=axes[1])
+        self._annotated_heatmap(axes[1], cm_normalized, '.2f', labels)
         axes[1].set_xlabel('Human Classification')
         axes[1].set_ylabel('Claude Classification')
         axes[1].set_title('Confusion Matrix (Normalized by Row)')
@@ -285,20 +430,62 @@ class PhillipsValidationAnalyzer:
 
         print(f"\nConfusion matrix saved to {output_file}")
 
-    def generate_report(self, merged_df, human_col='classification', claude_col='claude_pc_category'):
+    def _annotated_heatmap(self, ax, data, fmt, labels):
+        """
+        Draw a labelled, annotated heatmap with a single imshow (in place of seaborn's heatmap).
+        """
+        image = ax.imshow(data, cmap='Blues', aspect='auto')
+        ax.figure.colorbar(image, ax=ax)
+        ax.set_xticks(np.arange(len(labels)))
+        ax.set_xticklabels(labels)
+        ax.set_yticks(np.arange(len(labels)))
+        ax.set_yticklabels(labels)
+
+        # Light text on dark cells, as seaborn's annotations do
+        threshold = (data.max() + data.min()) / 2
+        for (i, j), value in np.ndenumerate(data):
+            ax.text(j, i, format(value, fmt), ha='center', va='center',
+                    color='white' if value > threshold else 'black')
+
+    def generate_report(self, merged_df, human_col='classification', claude_col='claude_pc_category',
+                        report_file='validation_report_phillips.txt'):
         """
         Generate comprehensive validation report.
+
+        The report is buffered, written to stdout in one go and saved to report_file
+        (pass None to skip saving).
         """
-        agreement = self.calculate_agreement_metrics(merged_df, human_col, claude_col)
-        cm, report = self.calculate_confusion_matrix(merged_df, human_col, claude_col)
-        disagreements = self.analyze_disagreements(merged_df, human_col, claude_col)
+        self._out = io.StringIO()
+        try:
+            results = self._write_report(merged_df, human_col, claude_col)
+            text = self._out.getvalue()
+        finally:
+            self._out = None
+
+        sys.stdout.write(text)
+        if report_file is not None:
+            Path(report_file).write_text(text)
+            print(f"\nReport saved to {report_file}")
+
+        return results
+
+    def _write_report(self, merged_df, human_col, claude_col):
+        """
+        Write every report section and the summary to the current destination.
+        """
+        # Filter missing classifications once and share the result with every section
+        valid = merged_df.loc[merged_df[human_col].notna() & merged_df[claude_col].notna()]
+
+        agreement = self.calculate_agreement_metrics(valid, human_col, claude_col, prefiltered=True)
+        cm, report = self.calculate_confusion_matrix(valid, human_col, claude_col, prefiltered=True)
+        disagreements = self.analyze_disagreements(valid, human_col, claude_col, prefiltered=True)
 
         # Summary
-        print("\n" + "="*60)
-        print("VALIDATION SUMMARY")
-        print("="*60)
+        self._print("\n" + "="*60)
+        self._print("VALIDATION SUMMARY")
+        self._print("="*60)
 
-        print(f"""
+        self._print(f"""
 Phillips Curve Classification Validation
 -----------------------------------------
 Sample size: {agreement['n']}